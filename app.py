@@ -1,11 +1,28 @@
+import atexit
+import hashlib
+import hmac
 import os
+import queue
 import random
+import re
 import json
+import secrets
+import sys
+import tempfile
+import threading
 import time
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional, Union
 from functools import wraps
 
 from flask import Flask, render_template, request, redirect, url_for, jsonify, Response
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
+from jinja2 import FileSystemBytecodeCache
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
 
 
 APP_TITLE = "gomgom.id"
@@ -13,9 +30,16 @@ MAX_PLAYERS = 10
 MAP_WIDTH = 900
 MAP_HEIGHT = 600
 PLAYER_RADIUS = 14
-
-# User data file path
-USER_DATA_FILE = "data/users.json"
+_PALETTE = (
+    "#e6194B", "#3cb44b", "#ffe119", "#0082c8", "#f58231",
+    "#911eb4", "#46f0f0", "#f032e6", "#d2f53c", "#fabebe",
+    "#008080", "#e6beff", "#aa6e28", "#fffac8", "#800000",
+    "#aaffc3", "#808000", "#ffd8b1", "#000080", "#808080",
+)
+
+# User data file path (JSON lines, one user per line)
+USER_DATA_FILE = "data/users.jsonl"
+_LEGACY_USER_DATA_FILE = "data/users.json"
 # Links data file path
 LINKS_DATA_FILE = "data/links.json"
 # Schedules data file path
@@ -23,132 +47,432 @@ SCHEDULES_DATA_FILE = "data/schedules.json"
 # Articles data file path
 ARTICLES_DATA_FILE = "data/articles.json"
 CV_FILE = "mycv"
+# Set PRETTY=1 to write indented JSON (data files and API responses) for debugging
+JSON_PRETTY = os.environ.get("PRETTY") == "1"
+# Stdlib fallback encoders, built once instead of per json.dumps() call
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+_JSON_PRETTY_ENCODER = json.JSONEncoder(indent=2, separators=(",", ": "), ensure_ascii=False)
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, pretty: bool = JSON_PRETTY) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (indented when pretty)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return (_JSON_PRETTY_ENCODER if pretty else _JSON_ENCODER).encode(obj).encode("utf-8")
+
+# Parsed data files keyed by path: {"stamp": (st_mtime_ns, st_size), "items": [...], <view name>: ...}
+# A stamp of None means the items were saved in memory and not flushed to disk yet.
+# Cached lists and their records are shared by every request and the writer thread:
+# treat them as read-only and change them only through _update_items().
+_DATA_CACHE: Dict[str, Dict[str, Any]] = {}
+_DATA_LOCK = threading.Lock()
+# Serializes flushes between the writer thread and the exit hook
+_WRITE_LOCK = threading.Lock()
+# Paths waiting for the writer thread, mapped to the records to append to them or to
+# None for a full rewrite; a path is queued at most once until flushed
+_write_queue: queue.Queue = queue.Queue()
+_pending_writes: Dict[str, Any] = {}
+
+
+def _read_json_file(path: str) -> list:
+    """Parse a JSON array file (JSON lines for .jsonl); a missing or empty file reads as []"""
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return []
+    with f:
+        if path.endswith(".jsonl"):
+            return _read_json_lines(path, f)
+        data = f.read()
+        return _json_loads(data) if data else []
+
+
+def _read_json_lines(path: str, f) -> list:
+    """Records of a JSON lines file, skipping (and logging) lines that do not parse,
+    such as the partial last line an interrupted append leaves"""
+    items = []
+    for lineno, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            items.append(_json_loads(line))
+        except ValueError as e:
+            print(f"Skipping unreadable line {lineno} of {path}: {e}")
+    return items
 
-def load_users():
-    """Load users from JSON file"""
+
+def _file_stamp(st: os.stat_result) -> tuple:
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_cached(path: str) -> list:
+    """Return the parsed JSON list in path, re-reading it only when its mtime or size changes"""
+    with _DATA_LOCK:
+        return _load_locked(path)
+
+
+def _load_locked(path: str) -> list:
+    """_load_cached() for callers already holding _DATA_LOCK"""
+    entry = _DATA_CACHE.get(path)
+    if entry is not None and entry["stamp"] is None:
+        return entry["items"]
     try:
-        if os.path.exists(USER_DATA_FILE):
-            with open(USER_DATA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        st = os.stat(path)
+    except FileNotFoundError:
+        _DATA_CACHE.pop(path, None)
         return []
+    stamp = _file_stamp(st)
+    if entry is None or entry["stamp"] != stamp:
+        items = _read_json_file(path) if st.st_size > 0 else []
+        entry = _DATA_CACHE[path] = {"stamp": stamp, "items": items}
+    return entry["items"]
+
+
+def _cached_view(path: str, items: list, name: str, build: Callable[[list], Any]) -> Any:
+    """Return build(items), memoized on the cache entry of path until it is reloaded or saved"""
+    entry = _DATA_CACHE.get(path)
+    if entry is None or entry["items"] is not items:
+        return build(items)
+    if name not in entry:
+        entry[name] = build(items)
+    return entry[name]
+
+
+def _json_bytes(items: list) -> bytes:
+    """Serialized response body for items, built once per cache entry via _cached_view"""
+    return _json_dumps(items)
+
+
+def _stage_locked(path: str, items: list, record: Optional[Dict[str, Any]] = None) -> bool:
+    """Make items the cached contents of path and mark the file for a full rewrite, or for
+    appending record (the last of items) to a JSON lines file; returns whether path still
+    has to be queued. Call with _DATA_LOCK held."""
+    previous = _DATA_CACHE.get(path)
+    _DATA_CACHE[path] = {"stamp": None, "items": items}
+    if path in _pending_writes:
+        if record is None:
+            _pending_writes[path] = None
+        elif _pending_writes[path] is not None:
+            _pending_writes[path].append(record)
+        return False
+    if record is None or (previous is not None and previous["stamp"] is None):
+        # A failed flush leaves the file behind memory, so it is rewritten whole
+        _pending_writes[path] = None
+    else:
+        _pending_writes[path] = [record]
+    return True
+
+
+def _update_items(path: str, change: Callable[[list], Optional[list]], append: bool = False) -> Optional[list]:
+    """Replace the cached items of path with change(items) and queue the write, or leave
+    them alone if change returns None; returns the new list (or None).
+
+    Copy-on-write: the cached list and its records are never modified in place, since
+    readers and the writer thread may be using them. change returns a new list and builds
+    new dicts for the records it edits. It runs under _DATA_LOCK, so it sees every earlier
+    update and nothing can change items between its lookups and its result; it must not do
+    I/O or call the load_*/save_* helpers. With append=True the new list is items plus one
+    record at the end, which is appended to the JSON lines file instead of rewriting it.
+    """
+    with _DATA_LOCK:
+        items = change(_load_locked(path))
+        if items is None:
+            return None
+        queue_it = _stage_locked(path, items, items[-1] if append else None)
+    if queue_it:
+        _write_queue.put(path)
+    return items
+
+
+def _jsonl_line(record: Dict[str, Any]) -> bytes:
+    return _json_dumps(record, pretty=False) + b"\n"
+
+
+def _write_fd(fd: int, payload: bytes) -> None:
+    """os.write until payload is fully written, then fsync"""
+    view = memoryview(payload)
+    while view:
+        view = view[os.write(fd, view):]
+    os.fsync(fd)
+
+
+def _write_json_atomic(path: str, items: list, exclusive: bool = False) -> None:
+    """Replace path with items in one write, via a temp file and os.replace, so readers
+    and crashes never see a truncated file; with exclusive, create path instead and raise
+    FileExistsError if it already exists"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    if path.endswith(".jsonl"):
+        payload = b"".join(_jsonl_line(item) for item in items)
+    else:
+        payload = _json_dumps(items)
+    # A unique temp file per call, so concurrent writers never share one
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        os.fchmod(fd, 0o644)
+        _write_fd(fd, payload)
+        os.close(fd)
+        fd = -1
+        if exclusive:
+            os.link(tmp_path, path)
+            os.unlink(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if fd != -1:
+            os.close(fd)
+        os.unlink(tmp_path)
+        raise
+
+
+def _append_jsonl(path: str, records: list) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = b"".join(_jsonl_line(record) for record in records)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            # Start on a new line rather than gluing onto a torn one
+            payload = b"\n" + payload
+        _write_fd(fd, payload)
+    finally:
+        os.close(fd)
+
+
+def _write_file(path: str, items: Optional[list], appends: Optional[list]) -> tuple:
+    """Rewrite path with items, or append the appends records; returns the new file stamp"""
+    if appends is None:
+        _write_json_atomic(path, items)
+    else:
+        _append_jsonl(path, appends)
+    return _file_stamp(os.stat(path))
+
+
+def _off_hub(fn: Callable[..., Any], *args: Any) -> Any:
+    """fn(*args) on gevent's native threadpool when gevent has monkey-patched threading (as
+    under gunicorn -k gevent), where threads are greenlets and a blocking write() and
+    fsync() would otherwise stall every request; a plain call otherwise. For file writes
+    only: fn must not touch locks or the data cache."""
+    monkey = sys.modules.get("gevent.monkey")
+    if monkey is not None and monkey.is_module_patched("threading"):
+        return sys.modules["gevent"].get_hub().threadpool.apply(fn, args)
+    return fn(*args)
+
+
+def _flush(path: str, off_hub: bool = False) -> None:
+    """Write the latest cached items of path, coalescing every save queued since the last flush"""
+    with _WRITE_LOCK:
+        with _DATA_LOCK:
+            entry = _DATA_CACHE.get(path)
+            appends = _pending_writes.pop(path, None)
+            if entry is None or entry["stamp"] is not None:
+                return
+            items = list(entry["items"]) if appends is None else None
+        try:
+            if off_hub:
+                stamp = _off_hub(_write_file, path, items, appends)
+            else:
+                stamp = _write_file(path, items, appends)
+        except Exception as e:
+            # Keep serving the in-memory copy; the next save retries with a full rewrite
+            print(f"Error saving {path}: {e}")
+            return
+        with _DATA_LOCK:
+            if _DATA_CACHE.get(path) is entry and path not in _pending_writes:
+                entry["stamp"] = stamp
+
+
+def _writer_loop() -> None:
+    while True:
+        _flush(_write_queue.get(), off_hub=True)
+
+
+def _flush_all() -> None:
+    """Flush every unsaved cache entry, used on interpreter exit"""
+    with _DATA_LOCK:
+        paths = [path for path, entry in _DATA_CACHE.items() if entry["stamp"] is None]
+    # Written in this thread: there is nothing left to serve, and no new threads can start
+    for path in paths:
+        _flush(path)
+
+
+threading.Thread(target=_writer_loop, name="data-writer", daemon=True).start()
+atexit.register(_flush_all)
+
+
+def load_users():
+    """Load users from the JSON lines file"""
+    try:
+        return _load_cached(USER_DATA_FILE)
     except Exception as e:
         print(f"Error loading users: {e}")
         return []
 
-def save_users(users):
-    """Save users to JSON file"""
+
+def _migrate_legacy_users():
+    """Convert the users.json array used before users.jsonl, once: only while users.jsonl
+    does not exist (an empty one just means no users); the old file is left in place"""
     try:
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(USER_DATA_FILE), exist_ok=True)
-        with open(USER_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(users, f, indent=2, ensure_ascii=False)
-        return True
+        if os.path.exists(USER_DATA_FILE):
+            return
+        legacy_users = _read_json_file(_LEGACY_USER_DATA_FILE)
+        if legacy_users:
+            _write_json_atomic(USER_DATA_FILE, legacy_users)
     except Exception as e:
-        print(f"Error saving users: {e}")
-        return False
+        print(f"Error migrating {_LEGACY_USER_DATA_FILE}: {e}")
+
+
+_migrate_legacy_users()
+
+
+def _index_users(users: list):
+    """Lowercased names and WhatsApp numbers already registered"""
+    return {u["name"].lower() for u in users}, {u["whatsapp"] for u in users}
 
 
 def load_links():
     """Load links from JSON file"""
     try:
-        if os.path.exists(LINKS_DATA_FILE) and os.path.getsize(LINKS_DATA_FILE) > 0:
-            with open(LINKS_DATA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return []
+        return _load_cached(LINKS_DATA_FILE)
     except Exception as e:
         print(f"Error loading links: {e}")
         return []
 
 
-def save_links(links):
-    """Save links to JSON file"""
-    try:
-        os.makedirs(os.path.dirname(LINKS_DATA_FILE), exist_ok=True)
-        with open(LINKS_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(links, f, indent=2, ensure_ascii=False)
-        return True
-    except Exception as e:
-        print(f"Error saving links: {e}")
-        return False
+def _index_by_id(items: list) -> Dict[str, Any]:
+    """Items keyed by ID; the first item wins if an ID is repeated"""
+    by_id: Dict[str, Any] = {}
+    for item in items:
+        by_id.setdefault(item.get("id"), item)
+    return by_id
+
+
+def _position(items: list, item_id: str) -> Optional[int]:
+    """List position of the first item with item_id, or None; a direct scan, since every
+    edit or delete replaces the list and an index would be rebuilt each time"""
+    return next((i for i, item in enumerate(items) if item.get("id") == item_id), None)
+
+
+def _with_changes(items: list, item_id: str, changes: Dict[str, Any]) -> Optional[list]:
+    """Copy of items with the item item_id replaced by a copy updated with changes, or
+    None if there is no such item; an _update_items() change"""
+    idx = _position(items, item_id)
+    if idx is None:
+        return None
+    return items[:idx] + [{**items[idx], **changes}] + items[idx + 1:]
+
+
+def _without_id(items: list, item_id: str) -> Optional[list]:
+    """Copy of items without the item item_id, or None if there is no such item; an
+    _update_items() change"""
+    idx = _position(items, item_id)
+    if idx is None:
+        return None
+    return items[:idx] + items[idx + 1:]
 
 
 def load_schedules():
     """Load schedules from JSON file"""
     try:
-        if os.path.exists(SCHEDULES_DATA_FILE) and os.path.getsize(SCHEDULES_DATA_FILE) > 0:
-            with open(SCHEDULES_DATA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return []
+        return _load_cached(SCHEDULES_DATA_FILE)
     except Exception as e:
         print(f"Error loading schedules: {e}")
         return []
 
 
-def save_schedules(items):
-    """Save schedules to JSON file"""
-    try:
-        os.makedirs(os.path.dirname(SCHEDULES_DATA_FILE), exist_ok=True)
-        with open(SCHEDULES_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(items, f, indent=2, ensure_ascii=False)
-        return True
-    except Exception as e:
-        print(f"Error saving schedules: {e}")
-        return False
+def _sorted_schedules(items: list) -> list:
+    """Schedules ordered by date, then type, then ID; sorted once per cache entry"""
+    return _cached_view(SCHEDULES_DATA_FILE, items, "sorted", _sort_schedules)
+
+
+def _sort_schedules(items: list) -> list:
+    return sorted(items, key=lambda x: (x.get("date") or "", x.get("type") or "", x.get("id") or ""))
+
+
+def _schedules_json(items: list) -> bytes:
+    return _json_bytes(_sorted_schedules(items))
 
 
 def load_articles():
     """Load articles from JSON file"""
     try:
-        if os.path.exists(ARTICLES_DATA_FILE) and os.path.getsize(ARTICLES_DATA_FILE) > 0:
-            with open(ARTICLES_DATA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return []
+        return _load_cached(ARTICLES_DATA_FILE)
     except Exception as e:
         print(f"Error loading articles: {e}")
         return []
 
 
-def save_articles(items):
-    """Save articles to JSON file"""
-    try:
-        os.makedirs(os.path.dirname(ARTICLES_DATA_FILE), exist_ok=True)
-        with open(ARTICLES_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(items, f, indent=2, ensure_ascii=False)
-        return True
-    except Exception as e:
-        print(f"Error saving articles: {e}")
-        return False
+# Characters dropped by the sanitizers (\w is Unicode-aware, like str.isalnum() plus "_")
+_NAME_DROP_RE = re.compile(r"[^\w '-]")
+_ID_DROP_RE = re.compile(r"[^\w-]")
+_SLUG_DROP_RE = re.compile(r"[^\w .-]")
+_SLUG_DASH_RE = re.compile(r"[ ._-]+")
 
 
 def sanitize_name(raw_name: str) -> str:
     if not raw_name:
         return ""
-    cleaned_chars = []
-    for ch in raw_name.strip():
-        if ch.isalnum() or ch in {" ", "-", "_", "'"}:
-            cleaned_chars.append(ch)
-    cleaned = "".join(cleaned_chars)
+    cleaned = _NAME_DROP_RE.sub("", raw_name.strip())
     return cleaned[:20] if cleaned else "Player"
 
 
 def random_color() -> str:
-    palette = [
-        "#e6194B", "#3cb44b", "#ffe119", "#0082c8", "#f58231",
-        "#911eb4", "#46f0f0", "#f032e6", "#d2f53c", "#fabebe",
-        "#008080", "#e6beff", "#aa6e28", "#fffac8", "#800000",
-        "#aaffc3", "#808000", "#ffd8b1", "#000080", "#808080",
-    ]
-    return random.choice(palette)
+    return random.choice(_PALETTE)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for jsonify and request.get_json"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
 
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+app.json.sort_keys = False
+app.json.compact = not JSON_PRETTY
 app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-secret")
+app.config["COMPRESS_MIMETYPES"] = [
+    "application/json",
+    "text/html",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+]
+app.config["COMPRESS_LEVEL"] = 6
+Compress(app)
+# Compiled templates persist across restarts and workers. Jinja's default directory
+# is private to the user (_jinja2-cache-<uid>, checked for owner and mode 0700), so
+# other local users cannot plant bytecode in it.
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
 
 ADMIN_USERNAME = os.environ.get("ADMIN_USERNAME", "gomgom")
 ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "gomgom")
+_ADMIN_USERNAME_BYTES = ADMIN_USERNAME.encode("utf-8")
+_ADMIN_PASSWORD_BYTES = ADMIN_PASSWORD.encode("utf-8")
 
 def _check_basic_auth(auth) -> bool:
-    return bool(auth and auth.username == ADMIN_USERNAME and auth.password == ADMIN_PASSWORD)
+    if not auth or auth.username is None or auth.password is None:
+        return False
+    # Constant-time compares; & (not "and") so both are always evaluated
+    user_ok = hmac.compare_digest(auth.username.encode("utf-8"), _ADMIN_USERNAME_BYTES)
+    password_ok = hmac.compare_digest(auth.password.encode("utf-8"), _ADMIN_PASSWORD_BYTES)
+    return user_ok & password_ok
 
 def _auth_required() -> Response:
     return Response(
@@ -171,49 +495,114 @@ def sanitize_id(raw_id: str) -> str:
     """Sanitize an ID for use in URL path (letters, numbers, dash, underscore)."""
     if not raw_id:
         return ""
-    cleaned_chars = []
-    for ch in raw_id.strip():
-        if ch.isalnum() or ch in {"-", "_"}:
-            cleaned_chars.append(ch)
-    return "".join(cleaned_chars)[:40].lower()
+    return _ID_DROP_RE.sub("", raw_id.strip())[:40].lower()
 
 
 def slugify_name(name: str) -> str:
     """Generate a URL-friendly slug from a name."""
-    base = []
-    for ch in (name or "").strip().lower():
-        if ch.isalnum():
-            base.append(ch)
-        elif ch in {" ", "-", "_", "."}:
-            base.append("-")
-        # else drop
-    # collapse dashes
-    slug = []
-    prev_dash = False
-    for ch in base:
-        if ch == "-":
-            if not prev_dash:
-                slug.append("-")
-            prev_dash = True
-        else:
-            slug.append(ch)
-            prev_dash = False
-    slug_str = "".join(slug).strip("-") or "link"
+    # drop other characters, then turn each run of separators into a single dash
+    base = _SLUG_DROP_RE.sub("", (name or "").strip().lower())
+    slug_str = _SLUG_DASH_RE.sub("-", base).strip("-") or "link"
     return slug_str[:40]
 
 
-RESERVED_IDS = {"admin", "api", "game", "static", "schedule", ""}
+RESERVED_IDS = frozenset({"admin", "api", "game", "static", "schedule", ""})
 
+# Rendered HTML of pages that only depend on their template and title
+_PAGE_CACHE: Dict[tuple, str] = {}
 
-@app.route("/")
-def index():
-    # Render CV from text file
+
+def _render_static_page(template: str, title: str) -> str:
+    """render_template for pages without per-request data, memoized outside debug mode"""
+    key = (template, title)
+    html = _PAGE_CACHE.get(key)
+    if html is None or app.debug:
+        html = _PAGE_CACHE[key] = render_template(template, title=title)
+    return html
+
+
+def _entry_etag(path: str, items: list) -> str:
+    """Validator for the cached contents of path: its file stamp, or a one-off token while
+    the contents are not flushed to disk yet"""
+    entry = _DATA_CACHE.get(path)
+    if entry is None or entry["items"] is not items:
+        return secrets.token_hex(8)
+    if "etag" not in entry:
+        stamp = entry["stamp"]
+        entry["etag"] = f"{stamp[0]:x}-{stamp[1]:x}" if stamp else secrets.token_hex(8)
+    return entry["etag"]
+
+
+def _html_etag(html: str) -> str:
+    return hashlib.sha1(html.encode("utf-8")).hexdigest()
+
+
+def _not_modified(etag: str) -> bool:
+    """Whether If-None-Match already holds etag, also in the "<etag>:gzip" form Flask-Compress sends"""
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    return any(tag == etag or tag.startswith(f"{etag}:") for tag in if_none_match.as_set(include_weak=True))
+
+
+def _revalidated(resp: Response, etag: str) -> Response:
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "public, max-age=5, must-revalidate"
+    return resp
+
+
+def _conditional(etag: str, build: Callable[[], Response]) -> Response:
+    """304 if the client has etag already, otherwise build() with the validator attached"""
+    if _not_modified(etag):
+        return _revalidated(Response(status=304), etag)
+    return _revalidated(build(), etag)
+
+
+def _ndjson_response(items: list) -> Response:
+    """Stream items one JSON object per line instead of building the whole body"""
+    snapshot = tuple(items)
+    return Response((_jsonl_line(item) for item in snapshot), mimetype="application/x-ndjson")
+
+
+def _parse_json_body() -> Dict[str, Any]:
+    """The JSON object in the request body, or {} if it is not JSON or not valid;
+    the raw body is not kept on the request after parsing"""
+    if not request.is_json:
+        return {}
+    try:
+        data = _json_loads(request.get_data(cache=False))
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+# CV text files keyed by path: (stamp, cv_text, parsed meta)
+_CV_CACHE: Dict[str, tuple] = {}
+
+
+def _load_cv():
+    """Return (cv_text, meta) for CV_FILE, re-reading and re-parsing only when it changes"""
+    try:
+        stamp = _file_stamp(os.stat(CV_FILE))
+    except OSError:
+        stamp = None
+    cached = _CV_CACHE.get(CV_FILE)
+    if cached is not None and cached[0] == stamp:
+        return cached[1], cached[2]
     try:
         with open(CV_FILE, 'r', encoding='utf-8') as f:
             cv_text = f.read()
     except Exception:
         cv_text = ""
     meta = parse_cv_meta(cv_text)
+    _CV_CACHE[CV_FILE] = (stamp, cv_text, meta)
+    return cv_text, meta
+
+
+@app.route("/")
+def index():
+    # Render CV from text file
+    cv_text, meta = _load_cv()
     return render_template(
         "cv.html",
         title=f"{APP_TITLE} · CV",
@@ -224,7 +613,7 @@ def index():
 
 @app.route("/apply-class")
 def apply_class():
-    return render_template("index.html", title=f"{APP_TITLE} · Apply Class")
+    return _render_static_page("index.html", f"{APP_TITLE} · Apply Class")
 
 
 
@@ -232,34 +621,30 @@ def apply_class():
 def get_users():
     """Get all registered users"""
     users = load_users()
-    return jsonify(users)
+    return _conditional(
+        _entry_etag(USER_DATA_FILE, users),
+        lambda: Response(_cached_view(USER_DATA_FILE, users, "json", _json_bytes), mimetype="application/json"),
+    )
+
+@app.route("/api/users.ndjson", methods=["GET"])
+def get_users_ndjson():
+    """Stream registered users as newline-delimited JSON"""
+    return _ndjson_response(load_users())
+
 
 @app.route("/api/users", methods=["POST"])
 def register_user():
     """Register a new user"""
     try:
-        data = request.get_json() or {}
+        data = _parse_json_body()
         name = data.get("name", "").strip()
         whatsapp = data.get("whatsapp", "").strip()
         
         if not name or not whatsapp:
             return jsonify({"error": "Name and WhatsApp number are required"}), 400
         
-        # Load existing users
-        users = load_users()
-        
-        # Check if user already exists
-        for user in users:
-            if user["name"].lower() == name.lower() or user["whatsapp"] == whatsapp:
-                return jsonify({"error": "User with this name or WhatsApp number already exists"}), 400
-        
-        # Check maximum users limit
-        if len(users) >= 20:
-            return jsonify({"error": "Maximum 20 users reached"}), 400
-        
-        # Add new user
+        # Add new user (its id is set once the current list is known)
         new_user = {
-            "id": len(users) + 1,
             "name": name,
             "whatsapp": whatsapp,
             "timestamp": request.headers.get("X-Forwarded-For", request.remote_addr)
@@ -279,29 +664,56 @@ def register_user():
             if key in data:
                 new_user[key] = data[key]
         
-        users.append(new_user)
-        
-        # Save to file
-        if save_users(users):
-            return jsonify({"success": True, "user": new_user, "message": f"Welcome, {name}!"}), 201
-        else:
-            return jsonify({"error": "Failed to save user data"}), 500
-            
+        error = None
+
+        def add(users):
+            nonlocal error
+            # Check if user already exists
+            names_lc, whatsapps = _cached_view(USER_DATA_FILE, users, "dedupe", _index_users)
+            if name.lower() in names_lc or whatsapp in whatsapps:
+                error = "User with this name or WhatsApp number already exists"
+                return None
+            # Check maximum users limit
+            if len(users) >= 20:
+                error = "Maximum 20 users reached"
+                return None
+            return users + [{"id": len(users) + 1, **new_user}]
+
+        # Save to file (appended in the background)
+        users = _update_items(USER_DATA_FILE, add, append=True)
+        if users is None:
+            return jsonify({"error": error}), 400
+        return jsonify({"success": True, "user": users[-1], "message": f"Welcome, {name}!"}), 201
+
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
 
+# Archive names in a directory: (st_mtime_ns of the directory, names)
+_ARCHIVE_CACHE: Dict[str, tuple] = {}
+
+
+def _list_archives(directory: str = "data") -> list:
+    """Sorted users_<batch> archive names (without .json), re-listed only when the directory changes"""
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    cached = _ARCHIVE_CACHE.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
+    with os.scandir(directory) as entries:
+        names = sorted(e.name for e in entries if e.name.startswith("users_") and e.name.endswith(".json") and e.is_file())
+    archives = tuple(name[:-5] for name in names)  # drop .json
+    _ARCHIVE_CACHE[directory] = (mtime, archives)
+    return list(archives)
+
+
 @app.route("/admin/users")
 @requires_auth
 def admin_users():
     users = load_users()
-    archives = []
-    try:
-        for fname in sorted(os.listdir("data")):
-            if fname.startswith("users_") and fname.endswith(".json") and fname != os.path.basename(USER_DATA_FILE):
-                archives.append(fname[:-5])  # drop .json
-    except FileNotFoundError:
-        pass
+    archives = _list_archives()
     return render_template("users.html", title=f"{APP_TITLE} · Users", users=users, archives=archives)
 
 
@@ -316,8 +728,7 @@ def admin_links():
 @requires_auth
 def create_link():
     # Accept JSON or form-urlencoded
-    data = request.get_json() if request.is_json else request.form.to_dict(flat=True)
-    data = data or {}
+    data = _parse_json_body() if request.is_json else request.form.to_dict(flat=True)
     name = (data.get("name") or "").strip()
     link = (data.get("link") or "").strip()
     desc = (data.get("desc") or "").strip()
@@ -330,37 +741,28 @@ def create_link():
         links = load_links()
         return render_template("links.html", title=f"{APP_TITLE} · Links", links=links, error=error), 400
 
-    links = load_links()
-    link_id = sanitize_id(raw_id) or slugify_name(name)
-
-    # Ensure unique ID
-    existing_ids = {item.get("id") for item in links}
-    base_id = link_id
-    suffix = 2
-    while link_id in existing_ids or link_id in RESERVED_IDS or link_id.startswith("users_"):
-        link_id = f"{base_id}-{suffix}"
-        suffix += 1
+    base_id = sanitize_id(raw_id) or slugify_name(name)
 
-    new_item = {"id": link_id, "name": name, "link": link, "desc": desc}
-    links.append(new_item)
+    def add(links):
+        # Ensure unique ID
+        existing_ids = _cached_view(LINKS_DATA_FILE, links, "by_id", _index_by_id)
+        link_id = base_id
+        suffix = 2
+        while link_id in existing_ids or link_id in RESERVED_IDS or link_id.startswith("users_"):
+            link_id = f"{base_id}-{suffix}"
+            suffix += 1
+        return links + [{"id": link_id, "name": name, "link": link, "desc": desc}]
 
-    if save_links(links):
-        if request.is_json:
-            return jsonify({"success": True, "link": new_item}), 201
-        return redirect(url_for("admin_links"))
-    else:
-        if request.is_json:
-            return jsonify({"error": "Failed to save link"}), 500
-        links = load_links()
-        return render_template("links.html", title=f"{APP_TITLE} · Links", links=links, error="Failed to save link"), 500
+    new_item = _update_items(LINKS_DATA_FILE, add)[-1]
+    if request.is_json:
+        return jsonify({"success": True, "link": new_item}), 201
+    return redirect(url_for("admin_links"))
 
 
 @app.route("/admin/schedules", methods=["GET"])
 @requires_auth
 def admin_schedules():
-    items = load_schedules()
-    # sort by date then type
-    items = sorted(items, key=lambda x: (x.get("date") or "", x.get("type") or "", x.get("id") or ""))
+    items = _sorted_schedules(load_schedules())
     return render_template("schedules.html", title=f"{APP_TITLE} · Schedules", items=items)
 
 
@@ -374,13 +776,9 @@ def create_schedule():
     if not date or not desc:
         items = load_schedules()
         return render_template("schedules.html", title=f"{APP_TITLE} · Schedules", items=items, error="Date and description are required"), 400
-    items = load_schedules()
-    new_id = f"sch-{int(time.time()*1000)}"
-    items.append({"id": new_id, "date": date, "desc": desc, "type": type_})
-    if save_schedules(items):
-        return redirect(url_for("admin_schedules"))
-    items = load_schedules()
-    return render_template("schedules.html", title=f"{APP_TITLE} · Schedules", items=items, error="Failed to save"), 500
+    new_item = {"id": f"sch-{time.time_ns() // 1_000_000}", "date": date, "desc": desc, "type": type_}
+    _update_items(SCHEDULES_DATA_FILE, lambda items: items + [new_item])
+    return redirect(url_for("admin_schedules"))
 
 
 @app.route("/admin/schedules/delete", methods=["POST"])
@@ -389,45 +787,50 @@ def delete_schedule():
     sched_id = (request.form.get("id") or "").strip()
     if not sched_id:
         return redirect(url_for("admin_schedules"))
-    items = load_schedules()
-    items = [it for it in items if it.get("id") != sched_id]
-    save_schedules(items)
+    _update_items(SCHEDULES_DATA_FILE, lambda items: _without_id(items, sched_id))
     return redirect(url_for("admin_schedules"))
 
 
 @app.route("/admin/schedules/<sched_id>", methods=["GET", "POST"])
 @requires_auth
 def edit_schedule(sched_id):
-    items = load_schedules()
-    idx = next((i for i, it in enumerate(items) if it.get("id") == sched_id), None)
-    if idx is None:
-        return redirect(url_for("admin_schedules"))
     if request.method == "POST":
+        # Parse the form before looking the schedule up: reading the body can yield to
+        # other requests, which may delete or replace it meanwhile
         data = request.form.to_dict(flat=True)
         date = (data.get("date") or "").strip()
         desc = (data.get("desc") or "").strip()
         type_ = (data.get("type") or "").strip() or "activity"
-        if not date or not desc:
-            return render_template("schedules_edit.html", title=f"{APP_TITLE} · Edit Schedule", item=items[idx], error="Date and description are required")
-        items[idx]["date"] = date
-        items[idx]["desc"] = desc
-        items[idx]["type"] = type_
-        if save_schedules(items):
+        if date and desc:
+            changes = {"date": date, "desc": desc, "type": type_}
+            _update_items(SCHEDULES_DATA_FILE, lambda items: _with_changes(items, sched_id, changes))
             return redirect(url_for("admin_schedules"))
-        return render_template("schedules_edit.html", title=f"{APP_TITLE} · Edit Schedule", item=items[idx], error="Failed to save")
-    return render_template("schedules_edit.html", title=f"{APP_TITLE} · Edit Schedule", item=items[idx])
+    items = load_schedules()
+    item = _cached_view(SCHEDULES_DATA_FILE, items, "by_id", _index_by_id).get(sched_id)
+    if item is None:
+        return redirect(url_for("admin_schedules"))
+    if request.method == "POST":
+        return render_template("schedules_edit.html", title=f"{APP_TITLE} · Edit Schedule", item=item, error="Date and description are required")
+    return render_template("schedules_edit.html", title=f"{APP_TITLE} · Edit Schedule", item=item)
 
 
 @app.route("/api/schedules", methods=["GET"])
 def api_schedules():
     items = load_schedules()
-    items = sorted(items, key=lambda x: (x.get("date") or "", x.get("type") or "", x.get("id") or ""))
-    return jsonify(items)
+    return _conditional(
+        _entry_etag(SCHEDULES_DATA_FILE, items),
+        lambda: Response(_cached_view(SCHEDULES_DATA_FILE, items, "json", _schedules_json), mimetype="application/json"),
+    )
+
+
+@app.route("/api/schedules.ndjson", methods=["GET"])
+def api_schedules_ndjson():
+    return _ndjson_response(_sorted_schedules(load_schedules()))
 
 
 @app.route("/schedule")
 def schedule_page():
-    return render_template("schedule.html", title=f"{APP_TITLE} · Schedule")
+    return _render_static_page("schedule.html", f"{APP_TITLE} · Schedule")
 
 
 @app.route("/<link_id>")
@@ -436,21 +839,24 @@ def link_detail(link_id):
     if not link_id or link_id in RESERVED_IDS:
         return redirect(url_for("index"))
     items = load_links()
-    for item in items:
-        if item.get("id") == link_id:
-            return render_template("link_detail.html", title=item.get("name") or "Link", item=item)
-    return render_template("link_detail.html", title="Not found", item=None), 404
+    item = _cached_view(LINKS_DATA_FILE, items, "by_id", _index_by_id).get(link_id)
+    if item is None:
+        return render_template("link_detail.html", title="Not found", item=None), 404
+    # Rendered pages live on the cache entry, so saving links drops them
+    pages = _cached_view(LINKS_DATA_FILE, items, "pages", lambda _: {})
+    page = pages.get(link_id)
+    if page is None or app.debug:
+        html = render_template("link_detail.html", title=item.get("name") or "Link", item=item)
+        page = pages[link_id] = (html, _html_etag(html))
+    html, etag = page
+    return _conditional(etag, lambda: Response(html, mimetype="text/html"))
 
 
 # --- Users batch archive ---
 def sanitize_batch_name(raw: str) -> str:
     if not raw:
         return ""
-    cleaned_chars = []
-    for ch in raw.strip():
-        if ch.isalnum() or ch in {"_", "-"}:
-            cleaned_chars.append(ch)
-    return "".join(cleaned_chars)[:64]
+    return _ID_DROP_RE.sub("", raw.strip())[:64]
 
 
 @app.route("/admin/users/archive", methods=["POST"])
@@ -460,13 +866,7 @@ def archive_users():
     batch = sanitize_batch_name(batch)
     if not batch:
         users = load_users()
-        archives = []
-        try:
-            for fname in sorted(os.listdir("data")):
-                if fname.startswith("users_") and fname.endswith(".json") and fname != os.path.basename(USER_DATA_FILE):
-                    archives.append(fname[:-5])
-        except FileNotFoundError:
-            pass
+        archives = _list_archives()
         return render_template("users.html", title=f"{APP_TITLE} · Users", users=users, archives=archives, error="Batch name required"), 400
 
     # Ensure filename ends with .json and is in data directory
@@ -474,27 +874,30 @@ def archive_users():
     archive_path = os.path.join("data", archive_file)
     if os.path.exists(archive_path):
         users = load_users()
-        archives = []
-        try:
-            for fname in sorted(os.listdir("data")):
-                if fname.startswith("users_") and fname.endswith(".json") and fname != os.path.basename(USER_DATA_FILE):
-                    archives.append(fname[:-5])
-        except FileNotFoundError:
-            pass
+        archives = _list_archives()
         return render_template("users.html", title=f"{APP_TITLE} · Users", users=users, archives=archives, error="Archive already exists"), 400
 
-    current_users = load_users()
-    # Save current users into archive
+    # Take the current users and clear the list in one step, so registrations that land
+    # while the archive is written stay in users.jsonl
+    archived = []
+
+    def take_all(users):
+        nonlocal archived
+        archived = users
+        return []
+
+    _update_items(USER_DATA_FILE, take_all)
+    # Save the taken users into the archive, putting them back in front if that fails
     try:
-        os.makedirs("data", exist_ok=True)
-        with open(archive_path, 'w', encoding='utf-8') as f:
-            json.dump(current_users, f, indent=2, ensure_ascii=False)
+        # Created exclusively: a concurrent archive of the same batch may have won the race
+        _off_hub(_write_json_atomic, archive_path, archived, True)
+    except FileExistsError:
+        users = _update_items(USER_DATA_FILE, lambda users: archived + users)
+        archives = _list_archives()
+        return render_template("users.html", title=f"{APP_TITLE} · Users", users=users, archives=archives, error="Archive already exists"), 400
     except Exception as e:
-        users = load_users()
+        users = _update_items(USER_DATA_FILE, lambda users: archived + users)
         return render_template("users.html", title=f"{APP_TITLE} · Users", users=users, error=f"Failed to write archive: {e}"), 500
-
-    # Clear users.json
-    save_users([])
     return redirect(url_for("admin_users"))
 
 
@@ -507,17 +910,27 @@ def view_users_batch(batch):
     if not os.path.exists(archive_path):
         return Response("Not Found", 404)
     try:
-        with open(archive_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _read_json_file(archive_path)
     except Exception:
         data = []
     return render_template("users.html", title=f"{APP_TITLE} · {batch}", users=data)
 
 
+# Lowercased lines that start a CV section (plus "skills", which only ends one)
+_CV_SECTION_MARKERS = frozenset({"contact", "top skills", "certifications", "experience", "education"})
+_CV_HEADINGS = _CV_SECTION_MARKERS | {"skills"}
+_CV_SKILLS_END = frozenset({"certifications", "experience", "education"})
+_CV_CERTIFICATIONS_END = frozenset({"experience", "education"})
+_CV_EXPERIENCE_END = frozenset({"education", "skills", "top skills", "certifications"})
+_CV_EXPERIENCE_SKIP = frozenset({"project key roles", "technologies"})
+_CV_TITLE_WORDS = ("developer", "engineer", "programmer")
+_CV_NOT_ENTRY_WORDS = ("month", "year", "present", "area")
+
+
 def parse_cv_meta(cv_text: str) -> Dict[str, Any]:
     """Lightweight parsing of plain-text CV into basic meta fields for UI."""
-    lines = [ln.strip() for ln in (cv_text or "").splitlines()]
-    lines = [ln for ln in lines if ln]
+    lines = [ln for ln in (ln.strip() for ln in (cv_text or "").splitlines()) if ln]
+    lows = [ln.lower() for ln in lines]
     data: Dict[str, Any] = {
         "name": "",
         "title": "",
@@ -530,66 +943,75 @@ def parse_cv_meta(cv_text: str) -> Dict[str, Any]:
         "experiences": [],
     }
 
-    # Contact block
-    try:
-        cidx = next(i for i, ln in enumerate(lines) if ln.lower() == "contact")
-        if cidx is not None:
-            # location is first non-empty after contact
-            for j in range(cidx + 1, min(cidx + 6, len(lines))):
-                if not data["location"] and lines[j] and "@" not in lines[j] and "linkedin.com" not in lines[j].lower():
-                    data["location"] = lines[j]
-                    break
-    except StopIteration:
-        pass
-
-    # Simple detectors
-    for ln in lines:
-        low = ln.lower()
-        if ("@" in ln) and not data["email"]:
+    # Single scan: section headings, contact detectors and name/title candidates
+    headings = []  # (index, lowered line) of every heading, in order
+    first_heading: Dict[str, int] = {}
+    dev_idx = None
+    fallback_name = ""
+    for i, (ln, low) in enumerate(zip(lines, lows)):
+        if low in _CV_HEADINGS:
+            headings.append((i, low))
+            first_heading.setdefault(low, i)
+        if not data["email"] and "@" in ln:
             data["email"] = ln
-        if ("linkedin.com" in low) and not data["linkedin"]:
-            data["linkedin"] = ln if ln.startswith("http") else f"https://{ln}" if not ln.startswith("www.") else f"https://{ln}"
-        if any(ch.isdigit() for ch in ln) and ("mobile" in low or ln.replace(" ", "").replace("+", "").replace("-", "").isdigit()) and not data["phone"]:
+        if not data["linkedin"] and "linkedin.com" in low:
+            data["linkedin"] = ln if ln.startswith("http") else f"https://{ln}"
+        if not data["phone"] and any(ch.isdigit() for ch in ln) and ("mobile" in low or ln.replace(" ", "").replace("+", "").replace("-", "").isdigit()):
             data["phone"] = ln
+        if dev_idx is None and any(w in low for w in _CV_TITLE_WORDS):
+            dev_idx = i
+        if not fallback_name and " " in ln and low not in _CV_SECTION_MARKERS:
+            fallback_name = ln
+
+    def next_heading(after: int, names: frozenset) -> int:
+        return next((i for i, low in headings if i > after and low in names), len(lines))
+
+    # Contact block: location is the first plain line shortly after "Contact"
+    cidx = first_heading.get("contact")
+    if cidx is not None:
+        for j in range(cidx + 1, min(cidx + 6, len(lines))):
+            if "@" not in lines[j] and "linkedin.com" not in lows[j]:
+                data["location"] = lines[j]
+                break
 
     # Name and title heuristics
-    dev_idx = next((i for i, ln in enumerate(lines) if any(w in ln.lower() for w in ["developer", "engineer", "programmer"])) , None)
     if dev_idx is not None and dev_idx > 0:
         data["title"] = lines[dev_idx]
         data["name"] = lines[dev_idx - 1]
     else:
         # fallback: first non Contact/section line with spaces
-        data["name"] = next((ln for ln in lines if " " in ln and ln.lower() not in {"contact", "top skills", "certifications", "experience", "education"}), "")
+        data["name"] = fallback_name
 
     # Skills
-    try:
-        sidx = next(i for i, ln in enumerate(lines) if ln.lower() == "top skills")
-        eidx = next((i for i, ln in enumerate(lines[sidx+1:], start=sidx+1) if ln.lower() in {"certifications", "experience", "education"}), len(lines))
-        data["skills"] = [ln for ln in lines[sidx+1:eidx] if ln]
-    except StopIteration:
-        pass
-
-    # Certifications
-    try:
-        cidx = next(i for i, ln in enumerate(lines) if ln.lower() == "certifications")
-        eidx = next((i for i, ln in enumerate(lines[cidx+1:], start=cidx+1) if ln.lower() in {"experience", "education"} or ln == data["name"]), len(lines))
-        data["certifications"] = [ln for ln in lines[cidx+1:eidx] if ln]
-    except StopIteration:
-        pass
+    sidx = first_heading.get("top skills")
+    if sidx is not None:
+        data["skills"] = lines[sidx + 1:next_heading(sidx, _CV_SKILLS_END)]
+
+    # Certifications, which also end where the name is repeated
+    cidx = first_heading.get("certifications")
+    if cidx is not None:
+        eidx = next_heading(cidx, _CV_CERTIFICATIONS_END)
+        try:
+            eidx = lines.index(data["name"], cidx + 1, eidx)
+        except ValueError:
+            pass
+        data["certifications"] = lines[cidx + 1:eidx]
 
     # Experiences (greedy, simple heuristic)
-    try:
-        ex_start = next(i for i, ln in enumerate(lines) if ln.lower() == "experience") + 1
-        ex_end = next((i for i, ln in enumerate(lines[ex_start:], start=ex_start) if ln.lower() in {"education", "skills", "top skills", "certifications"}), len(lines))
+    xidx = first_heading.get("experience")
+    if xidx is not None:
+        ex_start = xidx + 1
+        ex_end = next_heading(xidx, _CV_EXPERIENCE_END)
         i = ex_start
         while i < ex_end:
-            company = lines[i] if i < ex_end else ""
+            company = lines[i]
             role = lines[i+1] if i+1 < ex_end else ""
             dates_line = lines[i+2] if i+2 < ex_end else ""
             loc_line = lines[i+3] if i+3 < ex_end else ""
+            loc_low = lows[i+3] if i+3 < ex_end else ""
 
             # Validate minimal structure
-            if not company or ":" in company.lower():
+            if ":" in company:
                 i += 1
                 continue
             # Ensure dates look like a range
@@ -602,7 +1024,7 @@ def parse_cv_meta(cv_text: str) -> Dict[str, Any]:
             j = i + 4
             while j < ex_end:
                 ln = lines[j]
-                if ln.lower() in {"project key roles", "technologies"}:
+                if lows[j] in _CV_EXPERIENCE_SKIP:
                     j += 1
                     continue
                 # bullet lines
@@ -610,8 +1032,8 @@ def parse_cv_meta(cv_text: str) -> Dict[str, Any]:
                     bullets.append(ln.lstrip("- "))
                     j += 1
                     continue
-                # next entry boundary heuristic: short title-case line without colon and not starting with '-'
-                if (len(ln) < 60 and ":" not in ln and not ln.startswith("-") and not any(k in ln.lower() for k in ["month", "year", "present", "area"])):
+                # next entry boundary heuristic: short title-case line without colon
+                if len(ln) < 60 and ":" not in ln and not any(k in lows[j] for k in _CV_NOT_ENTRY_WORDS):
                     break
                 # otherwise skip lines within description
                 j += 1
@@ -620,23 +1042,17 @@ def parse_cv_meta(cv_text: str) -> Dict[str, Any]:
                 "company": company,
                 "role": role,
                 "dates": dates_line,
-                "location": loc_line if ("area" in loc_line.lower() or "indonesia" in loc_line.lower()) else "",
+                "location": loc_line if ("area" in loc_low or "indonesia" in loc_low) else "",
                 "bullets": bullets,
             })
 
             i = j
-    except StopIteration:
-        pass
 
     return data
 
 
 # --- Articles CMS ---
 
-def _find_article_index_by_id(items: list, article_id: str):
-    return next((i for i, it in enumerate(items) if (it.get("id") or "") == article_id), None)
-
-
 @app.route("/admin/articles", methods=["GET"])
 @requires_auth
 def admin_articles():
@@ -653,8 +1069,7 @@ def admin_articles():
 @requires_auth
 def create_article():
     # Accept JSON or form-urlencoded
-    data = request.get_json() if request.is_json else request.form.to_dict(flat=True)
-    data = data or {}
+    data = _parse_json_body() if request.is_json else request.form.to_dict(flat=True)
     title = (data.get("title") or "").strip()
     raw_id = (data.get("id") or "").strip()
     external_link = (data.get("external_link") or "").strip()
@@ -663,7 +1078,7 @@ def create_article():
         blocks = data.get("blocks") or []
     else:
         try:
-            blocks = json.loads(blocks_json) if blocks_json else []
+            blocks = _json_loads(blocks_json) if blocks_json else []
         except Exception:
             blocks = []
 
@@ -671,64 +1086,62 @@ def create_article():
         items = load_articles()
         return render_template("articles.html", title=f"{APP_TITLE} · Articles", items=items, error="Title is required"), 400
 
-    items = load_articles()
-    art_id = sanitize_id(raw_id) or slugify_name(title)
-
-    # Ensure unique ID
-    existing_ids = {item.get("id") for item in items}
-    base_id = art_id
-    suffix = 2
-    while art_id in existing_ids or art_id in RESERVED_IDS or art_id.startswith("users_"):
-        art_id = f"{base_id}-{suffix}"
-        suffix += 1
-
-    new_item = {
-        "id": art_id,
-        "title": title,
-        "external_link": external_link,
-        "blocks": blocks,
-        "created_ts": int(time.time() * 1000),
-        "updated_ts": int(time.time() * 1000),
-    }
-    items.append(new_item)
-    if save_articles(items):
-        if request.is_json:
-            return jsonify({"success": True, "article": new_item}), 201
-        return redirect(url_for("admin_articles"))
-    else:
-        if request.is_json:
-            return jsonify({"error": "Failed to save article"}), 500
-        items = load_articles()
-        return render_template("articles.html", title=f"{APP_TITLE} · Articles", items=items, error="Failed to save article"), 500
+    base_id = sanitize_id(raw_id) or slugify_name(title)
+    now_ms = time.time_ns() // 1_000_000
+
+    def add(items):
+        # Ensure unique ID
+        existing_ids = _cached_view(ARTICLES_DATA_FILE, items, "by_id", _index_by_id)
+        art_id = base_id
+        suffix = 2
+        while art_id in existing_ids or art_id in RESERVED_IDS or art_id.startswith("users_"):
+            art_id = f"{base_id}-{suffix}"
+            suffix += 1
+        new_item = {
+            "id": art_id,
+            "title": title,
+            "external_link": external_link,
+            "blocks": blocks,
+            "created_ts": now_ms,
+            "updated_ts": now_ms,
+        }
+        return items + [new_item]
+
+    new_item = _update_items(ARTICLES_DATA_FILE, add)[-1]
+    if request.is_json:
+        return jsonify({"success": True, "article": new_item}), 201
+    return redirect(url_for("admin_articles"))
 
 
 @app.route("/admin/articles/<article_id>", methods=["GET", "POST"])
 @requires_auth
 def edit_article(article_id):
-    items = load_articles()
-    idx = _find_article_index_by_id(items, article_id)
-    if idx is None:
-        return redirect(url_for("admin_articles"))
-
     if request.method == "POST":
+        # Parse the form before looking the article up (see edit_schedule)
         data = request.form.to_dict(flat=True)
         title = (data.get("title") or "").strip()
         external_link = (data.get("external_link") or "").strip()
         blocks_json = data.get("blocks_json")
         try:
-            blocks = json.loads(blocks_json) if blocks_json else []
+            blocks = _json_loads(blocks_json) if blocks_json else []
         except Exception:
             blocks = []
-        if not title:
-            return render_template("articles_edit.html", title=f"{APP_TITLE} · Edit Article", item=items[idx], error="Title is required")
-        items[idx]["title"] = title
-        items[idx]["external_link"] = external_link
-        items[idx]["blocks"] = blocks
-        items[idx]["updated_ts"] = int(time.time() * 1000)
-        if save_articles(items):
+        if title:
+            changes = {
+                "title": title,
+                "external_link": external_link,
+                "blocks": blocks,
+                "updated_ts": time.time_ns() // 1_000_000,
+            }
+            _update_items(ARTICLES_DATA_FILE, lambda items: _with_changes(items, article_id, changes))
             return redirect(url_for("admin_articles"))
-        return render_template("articles_edit.html", title=f"{APP_TITLE} · Edit Article", item=items[idx], error="Failed to save")
-    return render_template("articles_edit.html", title=f"{APP_TITLE} · Edit Article", item=items[idx])
+    items = load_articles()
+    item = _cached_view(ARTICLES_DATA_FILE, items, "by_id", _index_by_id).get(article_id)
+    if item is None:
+        return redirect(url_for("admin_articles"))
+    if request.method == "POST":
+        return render_template("articles_edit.html", title=f"{APP_TITLE} · Edit Article", item=item, error="Title is required")
+    return render_template("articles_edit.html", title=f"{APP_TITLE} · Edit Article", item=item)
 
 
 @app.route("/admin/articles/delete", methods=["POST"])
@@ -737,26 +1150,34 @@ def delete_article():
     art_id = (request.form.get("id") or "").strip()
     if not art_id:
         return redirect(url_for("admin_articles"))
-    items = load_articles()
-    items = [it for it in items if (it.get("id") or "") != art_id]
-    save_articles(items)
+    _update_items(ARTICLES_DATA_FILE, lambda items: _without_id(items, art_id))
     return redirect(url_for("admin_articles"))
 
 
 @app.route("/a/<article_id>")
 def article_detail(article_id):
     items = load_articles()
-    for item in items:
-        if (item.get("id") or "") == article_id:
-            return render_template("article_detail.html", title=item.get("title") or "Article", item=item)
-    return render_template("article_detail.html", title="Not found", item=None), 404
+    item = _cached_view(ARTICLES_DATA_FILE, items, "by_id", _index_by_id).get(article_id)
+    if item is None:
+        return render_template("article_detail.html", title="Not found", item=None), 404
+    html = render_template("article_detail.html", title=item.get("title") or "Article", item=item)
+    return _conditional(_html_etag(html), lambda: Response(html, mimetype="text/html"))
+
+
+def _preload_templates():
+    """Compile every template at startup so no request pays the first-render compile"""
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+
+_preload_templates()
 
 
 if __name__ == "__main__":
-    # For local dev. In production behind a reverse proxy, set host/port via env.
+    # For local dev. In production serve wsgi:app with gunicorn (see wsgi.py).
     port = int(os.environ.get("PORT", 5000))
     print(f"Starting {APP_TITLE} on http://localhost:{port}")
-    # debug=True provides more logs; disable in production
-    app.run(host="0.0.0.0", port=port, debug=True)
+    # Debug mode (reloader, tracebacks, uncached pages) only with FLASK_ENV=development
+    app.run(host="0.0.0.0", port=port, debug=os.environ.get("FLASK_ENV") == "development")
 
 
@@ -13,8 +13,10 @@
   const players = new Map(); // id -> {id, name, x, y, color, spriteUrl}
   const spriteCache = new Map(); // url -> {img, ok}
 
+  // Go straight to WebSocket instead of starting on long-polling and upgrading
   const socket = io({
-    query: { name }
+    query: { name },
+    transports: ["websocket"]
   });
 
   socket.on("connect", () => {
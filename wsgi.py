@@ -0,0 +1,15 @@
+"""WSGI entry point for production.
+
+    gunicorn -k gevent -w 1 --worker-connections 1000 -b 0.0.0.0:${PORT:-5000} wsgi:app
+
+Keep a single worker process and scale with --worker-connections instead: the data
+caches and the background writer in app.py live in the process, so several workers
+would each hold, and write back, their own copy of the data files.
+
+Under gevent the writer thread becomes a greenlet; app.py hands its file writes and
+fsync (background flushes and user archives) to gevent's native threadpool so they do
+not block the other requests.
+"""
+from app import app
+
+__all__ = ["app"]